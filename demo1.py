@@ -7,6 +7,7 @@ No restart needed when toggling models in the web app.
 """
 
 import asyncio
+import queue
 import threading
 import time
 import os
@@ -18,6 +19,9 @@ load_dotenv(find_dotenv())
 
 from oureyes.puller_bis import pull_stream
 from oureyes.debug_timing import mark_stage
+from oureyes.log import get_logger
+
+log = get_logger("demo1")
 
 from models.fire_detection.fire_detection import fire_detection
 from models.ppe_detection.ppe_detection import ppe_detection
@@ -30,6 +34,12 @@ from models.time_count.time_count import time_count
 FPS          = 25
 POLL_INTERVAL = 5   # seconds between DB checks
 RESTART_DELAY = 5   # seconds before restarting a crashed thread
+# Upper bound on concurrent (model, camera) workers. Each worker is a
+# dedicated daemon thread that lives until its model is disabled — a
+# bounded ThreadPoolExecutor is the wrong primitive for permanent loops:
+# submissions past the pool size queue forever and those models silently
+# never run. Past this bound start_model refuses loudly instead.
+MAX_WORKERS = int(os.getenv("EYE_MAX_WORKERS", "64"))
 
 # Map model_name → function
 MODEL_FN = {
@@ -106,26 +116,33 @@ def fetch_enabled_models():
 _running: dict = {}
 _lock = threading.Lock()
 
-def sync_frames(queue, loop, label, stop_event):
-    """Yield frames from asyncio queue, stopping when stop_event is set."""
+def sync_frames(frame_queue, label, stop_event):
+    """Yield frames from the camera's FrameQueue until stop_event is set.
+
+    The capture thread puts straight into the queue (drop-oldest, maxlen 1)
+    so every get() here wakes to the newest frame — no event-loop hop,
+    forwarder task, or drain loop on the per-frame path.
+    """
     while not stop_event.is_set():
         try:
-            frame = asyncio.run_coroutine_threadsafe(
-                queue.get(), loop
-            ).result(timeout=5.0)
+            frame = frame_queue.get(timeout=5.0)
             mark_stage("model_input", label, frame, pop=False)
             yield frame
-        except Exception:
+        except queue.Empty:
             if stop_event.is_set():
                 return
-            time.sleep(0.2)
 
-def run_model_thread(model_fn, queue, loop, dest_cam, label, stop_event, zone_points=None, zone_labels=None, zone_absence_thresholds=None, zone_total_absence_thresholds=None, camera_id=None, camera_ai_id=None):
+def run_model_thread(model_fn, frame_queue, dest_cam, label, stop_event, zone_points=None, zone_labels=None, zone_absence_thresholds=None, zone_total_absence_thresholds=None, camera_id=None, camera_ai_id=None):
     """Run model in a loop, respecting stop_event."""
     ZONE_MODELS       = {"workstation_monitoring", "restricted_zone", "surveillance_zones", "time_count"}
     ZONE_LABEL_MODELS = {"restricted_zone"}  # only these accept zone_labels
     model_name = label.split("[")[0]
 
+    # One frame generator for the thread's lifetime — models themselves are
+    # cached in model_registry, so a crash-restart only pays for re-entering
+    # model_fn, not for a model reload.
+    frames_gen = sync_frames(frame_queue, label, stop_event)
+
     while not stop_event.is_set():
         try:
             print(f"🚀 [{label}] → {dest_cam}")
@@ -142,16 +159,14 @@ def run_model_thread(model_fn, queue, loop, dest_cam, label, stop_event, zone_po
                 kwargs["camera_id"] = camera_id
             if camera_ai_id is not None:
                 kwargs["camera_ai_id"] = camera_ai_id
-            model_fn(sync_frames(queue, loop, label, stop_event), **kwargs)
+            model_fn(frames_gen, **kwargs)
         except Exception as e:
             if stop_event.is_set():
                 break
-            import traceback
-            print(f"❌ [{label}] crashed: {e}")
-            traceback.print_exc()
+            log.exception(f"[{label}] crashed: {e}")
             time.sleep(RESTART_DELAY)
 
-async def start_model(row, loop):
+async def start_model(row):
     """Start a model thread for a DB row."""
     key = (row["model_name"], row["camera_stream"])
     with _lock:
@@ -163,25 +178,34 @@ async def start_model(row, loop):
         print(f"⚠️  No function for model: {row['model_name']}")
         return
 
-    queue     = await pull_stream(row["camera_stream"])
+    with _lock:
+        active = len(_running)
+    if active >= MAX_WORKERS:
+        print(f"⚠️  Worker limit reached ({MAX_WORKERS}) — NOT starting "
+              f"{row['model_name']}[{row['camera_stream']}]; raise EYE_MAX_WORKERS")
+        return
+
+    frame_queue = await pull_stream(row["camera_stream"])
     stop_evt  = threading.Event()
     label     = f"{row['model_name']}[{row['camera_stream']}]"
     dest_cam  = row["stream_id"]
 
-    t = threading.Thread(
+    thread = threading.Thread(
         target=run_model_thread,
-        args=(model_fn, queue, loop, dest_cam, label, stop_evt,
-              row.get("zone_points", []), row.get("zone_labels", []),
-              row.get("zone_absence_thresholds", []),
-              row.get("zone_total_absence_thresholds", []),
-              row.get("camera_id"), row.get("id")),
-        name=label,
+        args=(
+            model_fn, frame_queue, dest_cam, label, stop_evt,
+            row.get("zone_points", []), row.get("zone_labels", []),
+            row.get("zone_absence_thresholds", []),
+            row.get("zone_total_absence_thresholds", []),
+            row.get("camera_id"), row.get("id"),
+        ),
+        name=f"model-{label}",
         daemon=True,
     )
-    t.start()
+    thread.start()
 
     with _lock:
-        _running[key] = {"thread": t, "stop": stop_evt, "queue": queue}
+        _running[key] = {"thread": thread, "stop": stop_evt, "queue": frame_queue}
 
     print(f"✅ Started  {label} → {dest_cam}")
 
@@ -195,7 +219,6 @@ def stop_model(key):
 
 # ── Main loop ─────────────────────────────────────────────────────────────
 async def main():
-    loop = asyncio.get_running_loop()
     print("=" * 60)
     print("OranextEYE — dynamic model runner")
     print(f"  Polling DB every {POLL_INTERVAL}s for enabled models")
@@ -207,13 +230,30 @@ async def main():
             enabled_rows = fetch_enabled_models()
             enabled_keys = {(r["model_name"], r["camera_stream"]) for r in enabled_rows}
 
-            # Start newly enabled models
+            # Start newly enabled models — concurrently, so N new cameras
+            # come up in ~one connect-time instead of N× (pull_stream can
+            # wait up to a minute for a stream that is still probing).
+            # Dedupe by key before launching: the schema allows several
+            # camera_ai rows per (model, camera), and concurrent starts
+            # no longer serialise through the _running check — starting a
+            # key twice would leave an unstoppable orphan worker.
+            new_rows = []
+            new_keys = set()
             for row in enabled_rows:
                 key = (row["model_name"], row["camera_stream"])
                 with _lock:
                     already = key in _running
-                if not already:
-                    await start_model(row, loop)
+                if not already and key not in new_keys:
+                    new_keys.add(key)
+                    new_rows.append(row)
+            if new_rows:
+                results = await asyncio.gather(
+                    *(start_model(row) for row in new_rows),
+                    return_exceptions=True,
+                )
+                for row, res in zip(new_rows, results):
+                    if isinstance(res, Exception):
+                        print(f"⚠️  Failed to start {row['model_name']}[{row['camera_stream']}]: {res}")
 
             # Stop disabled models
             with _lock:
@@ -13,10 +13,9 @@ import cv2
 import time
 import torch
 import numpy as np
-from PIL import Image
 
 from oureyes.emitter import emit_detections, emit_event
-from oureyes.model_registry import get_siglip, get_siglip_lock, DEVICE
+from oureyes.model_registry import get_siglip, siglip_predict, DEVICE
 
 # ── Config ────────────────────────────────────────────────────────────────
 MODEL_NAME = "prithivMLmods/Fire-Detection-Siglip2"
@@ -42,7 +41,6 @@ def fire_detection(frames, dest_cam: str, fps: int, camera_id: int = None, camer
 
     device = torch.device(DEVICE)
     model, processor, model_enabled = get_siglip(MODEL_NAME)
-    _infer_lock = get_siglip_lock(MODEL_NAME)
 
     # ── Grab first frame to get resolution ────────────────────────────────
     frame_iterator = iter(frames)
@@ -55,33 +53,60 @@ def fire_detection(frames, dest_cam: str, fps: int, camera_id: int = None, camer
     W, H = first_frame.shape[1], first_frame.shape[0]
     print(f"[fire_detection] {dest_cam} — {W}x{H}, model_enabled={model_enabled}")
 
+    # Model input resolution, from the processor config (224x224 for SigLIP)
+    _size = getattr(processor, "size", None) or {}
+    input_wh = (_size.get("width", 224), _size.get("height", 224))
+
+    # Pre-baked normalization constants from the processor config — the HF
+    # processor re-allocates dicts and normalizes in Python on every call,
+    # but mean/std never change between frames.
+    _mean = torch.tensor(processor.image_mean, device=device).view(1, 3, 1, 1)
+    _std  = torch.tensor(processor.image_std,  device=device).view(1, 3, 1, 1)
+
+    # Class labels are static — hoist the lookup and the fire/smoke test
+    _labels = model.config.id2label
+    _is_fire = [_labels[i].lower() in ("fire", "smoke") for i in range(len(_labels))]
+
+    # Reused per-frame buffers — steady-state inference allocates nothing
+    _small     = np.empty((input_wh[1], input_wh[0], 3), dtype=np.uint8)
+    _small_rgb = np.empty_like(_small)
+    _input_buf = torch.empty((1, 3, input_wh[1], input_wh[0]),
+                             dtype=torch.float32, device=device)
+
     last_predictions: dict = {}
     last_fire_detected = False
 
-    def run_inference(frame) -> tuple[dict, bool]:
-        """Run SigLIP on a single frame, return (predictions, fire_detected)."""
+    def run_inference(frame) -> tuple[dict, bool, str, float]:
+        """Run SigLIP on one frame, return (predictions, fire_detected, alert_label, alert_prob)."""
         nonlocal last_predictions, last_fire_detected
         if not model_enabled:
-            return {}, False
-
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        image = Image.fromarray(frame_rgb).convert("RGB")
-        inputs = processor(images=image, return_tensors="pt")
-        inputs = {k: v.to(device) for k, v in inputs.items()}
-        with _infer_lock:
-            with torch.no_grad():
-                logits = model(**inputs).logits
-            probs = torch.nn.functional.softmax(logits, dim=1).squeeze().cpu().tolist()
-
-        labels = model.config.id2label
-        predictions = {labels[i]: round(probs[i], 3) for i in range(len(probs))}
-        fire_detected = any(
-            lbl.lower() in ("fire", "smoke") and p >= CONFIDENCE_THRESHOLD
-            for lbl, p in predictions.items()
-        )
+            return {}, False, None, 0.0
+
+        # Downscale first: cvtColor and normalization then touch 224x224
+        # pixels instead of the full frame (~41x less bandwidth at 1080p).
+        # All three stages write into buffers allocated once at startup.
+        cv2.resize(frame, input_wh, dst=_small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(_small, cv2.COLOR_BGR2RGB, dst=_small_rgb)
+        # copy_ casts uint8 HWC -> float CHW into the resident tensor, then
+        # normalization runs as fused in-place ops (no HF processor path).
+        _input_buf.copy_(torch.from_numpy(_small_rgb).permute(2, 0, 1).unsqueeze(0))
+        pixel_values = _input_buf.div_(255.0).sub_(_mean).div_(_std)
+        # Concurrent cameras on this model are batched into one forward.
+        logits = siglip_predict(MODEL_NAME, pixel_values)
+        probs = torch.nn.functional.softmax(logits, dim=1).squeeze().cpu().tolist()
+
+        # One walk builds the prediction dict and picks the alert candidate —
+        # the old code re-iterated it for fire_detected and again for alerts.
+        predictions = {}
+        alert_label, alert_prob = None, 0.0
+        for i, p in enumerate(probs):
+            predictions[_labels[i]] = round(p, 3)
+            if _is_fire[i] and p > alert_prob:
+                alert_label, alert_prob = _labels[i], p
+        fire_detected = alert_prob >= CONFIDENCE_THRESHOLD
         last_predictions = predictions
         last_fire_detected = fire_detected
-        return predictions, fire_detected
+        return predictions, fire_detected, alert_label, alert_prob
 
     def build_detections(predictions: dict, fire_detected: bool) -> list:
         """
@@ -115,28 +140,27 @@ def fire_detection(frames, dest_cam: str, fps: int, camera_id: int = None, camer
         global _last_alert_time
         run_inf = (frame_idx % (FRAME_SKIP + 1) == 0) or not last_predictions
         if run_inf:
-            predictions, fire_detected = run_inference(frame)
+            predictions, fire_detected, alert_label, alert_prob = run_inference(frame)
         else:
             predictions, fire_detected = last_predictions, last_fire_detected
+            alert_label = None
 
         detections = build_detections(predictions, fire_detected)
         emit_detections(dest_cam, detections, W, H)
 
-        # Event alert (replaces Kafka)
-        if run_inf and fire_detected:
-            for lbl, prob in predictions.items():
-                if lbl.lower() in ("fire", "smoke") and prob >= CONFIDENCE_THRESHOLD:
-                    if time.time() - _last_alert_time >= ALERT_INTERVAL:
-                        emit_event(
-                            event_type=lbl.lower(),
-                            severity="critical",
-                            camera_id=camera_id,
-                            camera_ai_id=camera_ai_id,
-                            message=f"{lbl.capitalize()} detected with {prob*100:.0f}% confidence",
-                            metadata={"confidence": prob, "label": lbl}
-                        )
-                        print(f"[fire_detection] 🔥 {lbl} {prob:.2f} — event sent")
-                        _last_alert_time = time.time()
+        # Event alert (replaces Kafka) — candidate picked during inference
+        if run_inf and fire_detected and alert_label is not None:
+            if time.time() - _last_alert_time >= ALERT_INTERVAL:
+                emit_event(
+                    event_type=alert_label.lower(),
+                    severity="critical",
+                    camera_id=camera_id,
+                    camera_ai_id=camera_ai_id,
+                    message=f"{alert_label.capitalize()} detected with {alert_prob*100:.0f}% confidence",
+                    metadata={"confidence": alert_prob, "label": alert_label}
+                )
+                print(f"[fire_detection] 🔥 {alert_label} {alert_prob:.2f} — event sent")
+                _last_alert_time = time.time()
 
     # ── Main loop ─────────────────────────────────────────────────────────
     process(first_frame, 0)
@@ -6,11 +6,11 @@ Emits bounding-box detections to Angular overlay via Socket.IO.
 Model loaded once via model_registry, shared across all threads.
 """
 
-import cv2
 import os
 
 from oureyes.emitter import emit_detections
-from oureyes.model_registry import get_yolo, get_yolo_lock
+from oureyes.frame_gate import FrameGate
+from oureyes.model_registry import get_yolo, yolo_predict
 
 # ── Config ────────────────────────────────────────────────────────────────
 CLASS_NAMES        = ['Gloves', 'HairNet', 'Labcoat', 'Person']
@@ -42,43 +42,50 @@ def ppe_detection(frames, dest_cam: str, fps: int,
     W, H = first_frame.shape[1], first_frame.shape[0]
     print(f"[ppe_detection] {dest_cam} — {W}x{H}")
 
-    model = get_yolo(MODEL_PATH)
-    _infer_lock = get_yolo_lock(MODEL_PATH)
+    get_yolo(MODEL_PATH)  # load once at thread start
+    gate = FrameGate()    # skip inference when the scene hasn't changed
 
     last_detections: list = []
 
     def run_inference(frame) -> list:
         """Run YOLO and return normalised detection list."""
-        img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        with _infer_lock:
-            results = model(
-                img_rgb,
-                conf=CONFIDENCE_THRESHOLD,
-                classes=list(range(len(CLASS_NAMES))),
-                verbose=False,
-            )
-        r = results[0] if isinstance(results, list) else results
-        out=[]
-        for box in r.boxes:
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            conf   = float(box.conf[0])
-            cls_id = int(box.cls[0])
-            if conf >= CONFIDENCE_THRESHOLD and cls_id < len(CLASS_NAMES):
-                out.append({
-                    "label": CLASS_NAMES[cls_id],
-                    "conf":  round(conf, 3),
-                    "box": {
-                        "x": round(x1 / W, 4),
-                        "y": round(y1 / H, 4),
-                        "w": round((x2 - x1) / W, 4),
-                        "h": round((y2 - y1) / H, 4),
-                    },
-                })
+        # YOLO takes BGR ndarrays and converts internally — the old
+        # cvtColor here was an extra full-frame pass that double-swapped
+        # the channels.
+        r = yolo_predict(
+            MODEL_PATH, frame,
+            conf=CONFIDENCE_THRESHOLD,
+            classes=list(range(len(CLASS_NAMES))),
+            verbose=False,
+        )
+        out = []
+        if len(r.boxes):
+            # One device->host transfer per array — iterating r.boxes syncs
+            # xyxy/conf/cls scalar by scalar for every box.
+            # .tolist() yields plain Python scalars — keeps the dicts
+            # JSON-serializable for emit_detections.
+            xyxy    = r.boxes.xyxy.cpu().numpy().astype(int).tolist()
+            confs   = r.boxes.conf.cpu().tolist()
+            cls_ids = r.boxes.cls.cpu().numpy().astype(int).tolist()
+            for (x1, y1, x2, y2), conf, cls_id in zip(xyxy, confs, cls_ids):
+                if conf >= CONFIDENCE_THRESHOLD and cls_id < len(CLASS_NAMES):
+                    out.append({
+                        "label": CLASS_NAMES[cls_id],
+                        "conf":  round(conf, 3),
+                        "box": {
+                            "x": round(x1 / W, 4),
+                            "y": round(y1 / H, 4),
+                            "w": round((x2 - x1) / W, 4),
+                            "h": round((y2 - y1) / H, 4),
+                        },
+                    })
         return out
 
     def process(frame, frame_idx: int):
         nonlocal last_detections
         run_inf = (frame_idx % (FRAME_SKIP + 1) == 0) or frame_idx == 0
+        if run_inf and last_detections and not gate.changed(frame):
+            run_inf = False  # static scene — last detections still hold
         if run_inf:
             last_detections = run_inference(frame)
 
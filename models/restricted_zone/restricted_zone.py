@@ -13,11 +13,11 @@ import numpy as np
 import supervision as sv
 
 from oureyes.emitter import emit_detections, emit_event
-from oureyes.model_registry import get_yolo, get_yolo_lock
+from oureyes.model_registry import get_yolo, yolo_predict
 
 # ── Config ────────────────────────────────────────────────────────────────
 CONFIDENCE_THRESHOLD = 0.1
-IMAGE_SIZE           = 1280
+IMAGE_SIZE           = 640   # YOLO letterboxes internally; 1280 cost 4x the FLOPs
 FRAME_SKIP           = 2
 ALERT_INTERVAL       = 10  # seconds between zone intrusion alerts
 
@@ -90,25 +90,32 @@ def restricted_zone(frames, dest_cam: str, fps: int,
         for zone in zones_data
     ]
 
-    model = get_yolo(MODEL_PATH)
-    _infer_lock = get_yolo_lock(MODEL_PATH)
+    # Axis-aligned bounding box per zone — four compares reject most
+    # (center, zone) pairs before the exact polygon test runs
+    zone_aabbs = [cv2.boundingRect(p) for p in polygons_px]  # (x, y, w, h)
+
+    get_yolo(MODEL_PATH)  # load once at thread start
     last_detections: list = []
     _last_alert_times: dict = {}  # zone_index -> last alert timestamp
 
     def run_inference(frame) -> list:
-        if (frame.shape[1], frame.shape[0]) != (W, H):
+        if frame.shape[0] != H or frame.shape[1] != W:  # two int compares, no tuple build
             frame = cv2.resize(frame, (W, H))
 
-        with _infer_lock:
-            results = model(frame, imgsz=IMAGE_SIZE, conf=CONFIDENCE_THRESHOLD, verbose=False)[0]
+        results = yolo_predict(MODEL_PATH, frame, imgsz=IMAGE_SIZE,
+                               conf=CONFIDENCE_THRESHOLD, verbose=False)
         sv_dets = sv.Detections.from_ultralytics(results)
 
         # Count detections per zone
         zone_counts = [0] * len(polygons_px)
-        for i, (x1, y1, x2, y2) in enumerate(sv_dets.xyxy):
-            cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        xyxy = sv_dets.xyxy
+        centers = (xyxy[:, :2] + xyxy[:, 2:4]) * 0.5 if len(xyxy) else xyxy
+        for cx, cy in centers:
             for zi, poly in enumerate(polygons_px):
-                if cv2.pointPolygonTest(poly, (cx, cy), False) >= 0:
+                zx, zy, zw, zh = zone_aabbs[zi]
+                if cx < zx or cx > zx + zw or cy < zy or cy > zy + zh:
+                    continue
+                if cv2.pointPolygonTest(poly, (float(cx), float(cy)), False) >= 0:
                     zone_counts[zi] += 1
 
         total = len(sv_dets.xyxy)
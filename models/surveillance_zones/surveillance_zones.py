@@ -13,10 +13,10 @@ import numpy as np
 import supervision as sv
 
 from oureyes.emitter import emit_detections
-from oureyes.model_registry import get_yolo, get_yolo_lock
+from oureyes.model_registry import get_yolo, yolo_predict
 
 CONFIDENCE_THRESHOLD = 0.2
-IMAGE_SIZE           = 1280
+IMAGE_SIZE           = 640   # YOLO letterboxes internally; 1280 cost 4x the FLOPs
 FRAME_SKIP           = 2
 
 
@@ -65,8 +65,12 @@ def surveillance_zones(frames, dest_cam: str, fps: int,
         for zone in zones_data
     ]
 
-    model = get_yolo(MODEL_PATH)
-    _infer_lock = get_yolo_lock(MODEL_PATH)
+    model = get_yolo(MODEL_PATH)  # kept for model.names lookups
+
+    # Static per-zone strings, built once — only the timer suffix varies
+    zone_names     = [f"Zone {i+1}" for i in range(len(polygons_px))]
+    zone_ok_status = [f"{name}: OK (1 object)" for name in zone_names]
+    zone_status_ids = [f"zone_status_{i}" for i in range(len(polygons_px))]
 
     # Absence timer state per zone (frame number when zone became empty)
     zone_states = [{"absence_start_frame": None} for _ in polygons_px]
@@ -75,22 +79,29 @@ def surveillance_zones(frames, dest_cam: str, fps: int,
 
     def run_inference(frame) -> list:
         nonlocal frame_number
-        if (frame.shape[1], frame.shape[0]) != (W, H):
+        if frame.shape[0] != H or frame.shape[1] != W:  # two int compares, no tuple build
             frame = cv2.resize(frame, (W, H))
 
-        with _infer_lock:
-            results = model(frame, imgsz=IMAGE_SIZE, conf=CONFIDENCE_THRESHOLD, verbose=False)[0]
+        results = yolo_predict(MODEL_PATH, frame, imgsz=IMAGE_SIZE,
+                               conf=CONFIDENCE_THRESHOLD, verbose=False)
         sv_dets  = sv.Detections.from_ultralytics(results)
 
         out = []
 
+        # Box centers once per frame — the old loop recomputed every
+        # center from scratch for every zone (O(zones x detections) work).
+        xyxy = sv_dets.xyxy
+        if len(xyxy):
+            centers = (xyxy[:, :2] + xyxy[:, 2:4]) * 0.5
+        else:
+            centers = np.empty((0, 2))
+
         for zone_idx, poly in enumerate(polygons_px):
             # Find detections inside this zone
-            in_zone = []
-            for i, (x1, y1, x2, y2) in enumerate(sv_dets.xyxy):
-                cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
-                if cv2.pointPolygonTest(poly, (float(cx), float(cy)), False) >= 0:
-                    in_zone.append(i)
+            in_zone = [
+                i for i, (cx, cy) in enumerate(centers)
+                if cv2.pointPolygonTest(poly, (float(cx), float(cy)), False) >= 0
+            ]
 
             count = len(in_zone)
 
@@ -101,17 +112,16 @@ def surveillance_zones(frames, dest_cam: str, fps: int,
                 absence_frames = frame_number - zone_states[zone_idx]["absence_start_frame"]
                 absence_secs   = absence_frames / fps
                 mins, secs     = divmod(int(absence_secs), 60)
-                if count == 0:
-                    status = f"Zone {zone_idx+1}: empty {mins:02d}m{secs:02d}s"
+                status = f"{zone_names[zone_idx]}: empty {mins:02d}m{secs:02d}s"
             else:
                 zone_states[zone_idx]["absence_start_frame"] = None
                 if count == 1:
-                    status = f"Zone {zone_idx+1}: OK (1 object)"
+                    status = zone_ok_status[zone_idx]
                 else:
-                    status = f"Zone {zone_idx+1}: check ({count} objects)"
+                    status = f"{zone_names[zone_idx]}: check ({count} objects)"
 
             out.append({
-                "id":    f"zone_status_{zone_idx}",
+                "id":    zone_status_ids[zone_idx],
                 "label": status,
                 "conf":  None,
                 "box":   {"x": 0.0, "y": 0.0, "w": 0.0, "h": 0.0},
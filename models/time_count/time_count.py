@@ -12,7 +12,7 @@ import os
 import numpy as np
 
 from oureyes.emitter import emit_detections
-from oureyes.model_registry import get_yolo, get_yolo_lock
+from oureyes.model_registry import get_yolo, yolo_predict
 
 FRAME_SKIP = 2
 
@@ -67,33 +67,39 @@ def time_count(frames, dest_cam: str, fps: int,
     # Use plain YOLO + supervision ByteTrack instead of TrackZone
     # (avoids TrackZone's init-time region binding which breaks model_registry caching)
     import supervision as sv
-    model   = get_yolo(MODEL_PATH)
-    _infer_lock = get_yolo_lock(MODEL_PATH)
+    get_yolo(MODEL_PATH)  # load once at thread start
     tracker = sv.ByteTrack()
 
+    # Axis-aligned bounding box per region — rejects most points with four
+    # compares before paying for the exact polygon test
+    region_aabbs = [cv2.boundingRect(p) for p in region_polygons]  # (x, y, w, h)
+
     def in_any_region(cx: float, cy: float) -> bool:
-        return any(
-            cv2.pointPolygonTest(poly, (cx, cy), False) >= 0
-            for poly in region_polygons
-        )
+        for poly, (zx, zy, zw, zh) in zip(region_polygons, region_aabbs):
+            if (zx <= cx <= zx + zw and zy <= cy <= zy + zh
+                    and cv2.pointPolygonTest(poly, (cx, cy), False) >= 0):
+                return True
+        return False
 
     last_detections: list = []
 
     def run_inference(frame) -> list:
-        if (frame.shape[1], frame.shape[0]) != (W, H):
+        if frame.shape[0] != H or frame.shape[1] != W:  # two int compares, no tuple build
             frame = cv2.resize(frame, (W, H))
 
-        with _infer_lock:
-            results = model(frame, verbose=False, conf=0.25)[0]
+        results = yolo_predict(MODEL_PATH, frame, verbose=False, conf=0.25)
         sv_dets = sv.Detections.from_ultralytics(results)
         sv_dets = tracker.update_with_detections(sv_dets)
 
         out = []
-        if sv_dets.tracker_id is not None:
+        if sv_dets.tracker_id is not None and len(sv_dets.xyxy):
+            # All box centers in one vectorized pass instead of per-box
+            # Python arithmetic inside the loop.
+            xyxy    = sv_dets.xyxy
+            centers = (xyxy[:, :2] + xyxy[:, 2:4]) * 0.5
             for i, tid in enumerate(sv_dets.tracker_id):
-                x1, y1, x2, y2 = sv_dets.xyxy[i]
-                cx, cy  = (x1 + x2) / 2, (y1 + y2) / 2
-                working = in_any_region(cx, cy)
+                x1, y1, x2, y2 = xyxy[i]
+                working = in_any_region(float(centers[i, 0]), float(centers[i, 1]))
                 out.append({
                     "id":    str(tid),
                     "label": "Working" if working else "Not Working",
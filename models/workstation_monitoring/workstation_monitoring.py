@@ -20,13 +20,14 @@ Zone colors emitted via label markers:
 """
 
 import cv2
+import math
 import os
 import time
 import numpy as np
 import supervision as sv
 
 from oureyes.emitter import emit_detections, emit_event
-from oureyes.model_registry import get_yolo, get_yolo_lock
+from oureyes.model_registry import get_yolo, yolo_predict
 
 # ── Config ────────────────────────────────────────────────────────────────
 PERSON_CLASS_ID              = 0
@@ -91,6 +92,13 @@ def workstation_monitoring(frames, dest_cam: str, fps: int,
     ]
     n_zones = len(polygons_px)
 
+    # Rasterized zone lookup — one uint8 label per pixel, painted once
+    # (0 = no zone, i+1 = zone i). Reverse paint order keeps the old
+    # first-match semantics for overlapping zones.
+    zone_label_map = np.zeros((H, W), dtype=np.uint8)
+    for zi in range(n_zones - 1, -1, -1):
+        cv2.fillPoly(zone_label_map, [polygons_px[zi]], zi + 1)
+
     # Per-zone thresholds
     def _thresholds(src, default, n):
         if src and len(src) == n:
@@ -104,9 +112,8 @@ def workstation_monitoring(frames, dest_cam: str, fps: int,
     for i in range(n_zones):
         print(f"  Zone {i+1}: continuous={absence_thresholds[i]}s  total={total_absence_thresholds[i]}s")
 
-    model       = get_yolo(MODEL_PATH)
-    _infer_lock = get_yolo_lock(MODEL_PATH)
-    tracker     = sv.ByteTrack()
+    get_yolo(MODEL_PATH)  # load once at thread start
+    tracker = sv.ByteTrack()
 
     scale_factor       = W / 1280
     movement_threshold = BASE_MOVEMENT_THRESHOLD * scale_factor
@@ -136,17 +143,16 @@ def workstation_monitoring(frames, dest_cam: str, fps: int,
     def run_inference(frame) -> list:
         now = time.time()
 
-        if (frame.shape[1], frame.shape[0]) != (W, H):
+        if frame.shape[0] != H or frame.shape[1] != W:  # two int compares, no tuple build
             frame = cv2.resize(frame, (W, H))
 
         for d in zone_data:
             d["workers_present_now"] = 0
 
-        with _infer_lock:
-            results = model(
-                frame, imgsz=IMAGE_SIZE, verbose=False,
-                conf=CONFIDENCE_THRESHOLD, classes=[PERSON_CLASS_ID]
-            )[0]
+        results = yolo_predict(
+            MODEL_PATH, frame, imgsz=IMAGE_SIZE, verbose=False,
+            conf=CONFIDENCE_THRESHOLD, classes=[PERSON_CLASS_ID]
+        )
 
         sv_dets = sv.Detections.from_ultralytics(results)
         sv_dets = tracker.update_with_detections(sv_dets)
@@ -167,11 +173,9 @@ def workstation_monitoring(frames, dest_cam: str, fps: int,
                 pos  = bottoms[i]
                 cx, cy = float(pos[0]), float(pos[1])
 
-                person_zone = -1
-                for zi, poly in enumerate(polygons_px):
-                    if cv2.pointPolygonTest(poly, (cx, cy), False) >= 0:
-                        person_zone = zi
-                        break
+                px = min(max(int(cx), 0), W - 1)
+                py = min(max(int(cy), 0), H - 1)
+                person_zone = int(zone_label_map[py, px]) - 1
                 if person_zone == -1:
                     continue
 
@@ -179,10 +183,12 @@ def workstation_monitoring(frames, dest_cam: str, fps: int,
 
                 moving = True
                 if tid in worker_states and worker_states[tid]["station_id"] == person_zone:
-                    dist = np.linalg.norm(np.array(pos) - np.array(worker_states[tid]["last_pos"]))
-                    moving = dist > movement_threshold
+                    # Scalar hypot — np.linalg.norm allocated two temp
+                    # arrays per tracked worker per frame.
+                    last = worker_states[tid]["last_pos"]
+                    moving = math.hypot(cx - last[0], cy - last[1]) > movement_threshold
 
-                worker_states[tid] = {"station_id": person_zone, "last_pos": pos, "frames_since_seen": 0}
+                worker_states[tid] = {"station_id": person_zone, "last_pos": (cx, cy), "frames_since_seen": 0}
 
                 out.append({
                     "id":    str(tid),
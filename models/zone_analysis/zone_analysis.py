@@ -14,12 +14,13 @@ Fixes vs previous version:
 """
 
 import cv2
+import math
 import os
 import numpy as np
 import supervision as sv
 
 from oureyes.emitter import emit_detections
-from oureyes.model_registry import get_yolo, get_yolo_lock
+from oureyes.model_registry import get_yolo, yolo_predict
 
 # ── Config ────────────────────────────────────────────────────────────────
 PERSON_CLASS_ID         = 0       # COCO class 0 = person
@@ -82,43 +83,78 @@ def zone_analysis(frames, dest_cam: str, fps: int,
     # Create PolygonZone objects ONCE (not per frame)
     sv_zones = [sv.PolygonZone(polygon=p) for p in polygons_px]
 
-    model       = get_yolo(MODEL_PATH)
-    _infer_lock = get_yolo_lock(MODEL_PATH)
-    tracker     = sv.ByteTrack()
+    # Rasterized zone lookup — zones are static, so paint them once into a
+    # uint8 label map (0 = no zone, i+1 = zone i) and the per-person test
+    # becomes one indexed load instead of a polygon walk. Painted in
+    # reverse so overlaps resolve to the lowest index, matching the old
+    # first-match loop.
+    zone_label_map = np.zeros((H, W), dtype=np.uint8)
+    for zi in range(len(polygons_px) - 1, -1, -1):
+        cv2.fillPoly(zone_label_map, [polygons_px[zi]], zi + 1)
+
+    # ── Union-of-zones ROI ────────────────────────────────────────────────
+    # Detections outside every zone are discarded anyway, so inference can
+    # run on the zones' bounding region instead of the full frame. Padded
+    # generously (extra headroom above, since the anchor is bottom-center
+    # and bodies extend upward) and stride-aligned; only used when it
+    # actually shrinks the frame meaningfully.
+    use_roi = False
+    rx0 = ry0 = 0
+    roi_imgsz = IMAGE_SIZE
+    if polygons_px:
+        pts   = np.vstack(polygons_px)
+        pad_x = int(W * 0.15)
+        pad_y = int(H * 0.15)
+        rx0 = max(int(pts[:, 0].min()) - pad_x, 0)
+        ry0 = max(int(pts[:, 1].min()) - 2 * pad_y, 0)
+        rx1 = min(int(pts[:, 0].max()) + pad_x, W)
+        ry1 = min(int(pts[:, 1].max()) + pad_y, H)
+        rx0 -= rx0 % 32
+        ry0 -= ry0 % 32
+        use_roi = (rx1 - rx0) * (ry1 - ry0) < 0.7 * W * H
+        if use_roi:
+            roi_imgsz = max(32, min(IMAGE_SIZE,
+                                    ((max(rx1 - rx0, ry1 - ry0) + 31) // 32) * 32))
+            print(f"[zone_analysis] ROI {rx0},{ry0}→{rx1},{ry1} imgsz={roi_imgsz}")
+
+    get_yolo(MODEL_PATH)  # load once at thread start
+    tracker = sv.ByteTrack()
 
     scale_factor       = W / 1280
     movement_threshold = BASE_MOVEMENT_THRESHOLD * scale_factor
     dt                 = 1.0 / max(fps, 1)
 
     worker_states: dict = {}
-    workstation_data = [
-        {
-            "workers_present_now": 0,
-            "unoccupied_time":     0.0,
-            "total_presence_time": 0.0,
-            "total_active_time":   0.0,
-        }
-        for _ in polygons_px
-    ]
+
+    # Per-zone counters as parallel arrays — the per-frame reset and the
+    # time integrations become vector ops instead of dict walks.
+    K = len(polygons_px)
+    present_now   = np.zeros(K, dtype=np.int32)
+    unoccupied    = np.zeros(K)   # seconds with no worker present
+    presence_time = np.zeros(K)   # cumulative worker-seconds
+    active_time   = np.zeros(K)   # cumulative moving worker-seconds
 
     last_detections: list = []
 
     def run_inference(frame) -> list:
-        if (frame.shape[1], frame.shape[0]) != (W, H):
+        if frame.shape[0] != H or frame.shape[1] != W:  # two int compares, no tuple build
             frame = cv2.resize(frame, (W, H))
 
         # Reset per-frame counters
-        for d in workstation_data:
-            d["workers_present_now"] = 0
+        present_now[:] = 0
 
-        # Run inference on the FULL frame — no masking
-        with _infer_lock:
-            results = model(
-                frame, imgsz=IMAGE_SIZE, verbose=False,
-                conf=CONFIDENCE_THRESHOLD, classes=[PERSON_CLASS_ID]
-            )[0]
+        # Run inference on the zone ROI when it pays, full frame otherwise
+        inp = frame[ry0:ry1, rx0:rx1] if use_roi else frame
+        results = yolo_predict(
+            MODEL_PATH, inp, imgsz=roi_imgsz, verbose=False,
+            conf=CONFIDENCE_THRESHOLD, classes=[PERSON_CLASS_ID]
+        )
 
         sv_dets = sv.Detections.from_ultralytics(results)
+        if use_roi and len(sv_dets.xyxy):
+            # Boxes come back in ROI pixels — shift into full-frame coords
+            sv_dets.xyxy[:, [0, 2]] += rx0
+            sv_dets.xyxy[:, [1, 3]] += ry0
         sv_dets = tracker.update_with_detections(sv_dets)
 
         # Age out stale workers
@@ -139,33 +175,31 @@ def zone_analysis(frames, dest_cam: str, fps: int,
 
                 # Check which zone this person is in (use bottom-center point)
                 cx, cy = float(pos[0]), float(pos[1])
-                person_zone = -1
-                for idx, poly in enumerate(polygons_px):
-                    if cv2.pointPolygonTest(poly, (cx, cy), False) >= 0:
-                        person_zone = idx
-                        break
+                px = min(max(int(cx), 0), W - 1)
+                py = min(max(int(cy), 0), H - 1)
+                person_zone = int(zone_label_map[py, px]) - 1
 
                 if person_zone == -1:
                     # Person is outside all zones — skip
                     continue
 
                 # Update zone stats
-                workstation_data[person_zone]["workers_present_now"] += 1
-                workstation_data[person_zone]["total_presence_time"] += dt
+                present_now[person_zone]   += 1
+                presence_time[person_zone] += dt
 
                 moving = True
                 if tid in worker_states and worker_states[tid]["station_id"] == person_zone:
-                    dist = np.linalg.norm(
-                        np.array(pos) - np.array(worker_states[tid]["last_pos"])
-                    )
-                    moving = dist > movement_threshold
+                    # Scalar hypot — np.linalg.norm allocated two temp
+                    # arrays per tracked worker per frame.
+                    last = worker_states[tid]["last_pos"]
+                    moving = math.hypot(cx - last[0], cy - last[1]) > movement_threshold
 
                 if moving:
-                    workstation_data[person_zone]["total_active_time"] += dt
+                    active_time[person_zone] += dt
 
                 worker_states[tid] = {
                     "station_id":       person_zone,
-                    "last_pos":         pos,
+                    "last_pos":         (cx, cy),
                     "frames_since_seen": 0,
                 }
 
@@ -182,20 +216,19 @@ def zone_analysis(frames, dest_cam: str, fps: int,
                     },
                 })
 
-        # Update unoccupied time for empty zones
-        for d in workstation_data:
-            if d["workers_present_now"] == 0:
-                d["unoccupied_time"] += dt
+        # Update unoccupied time for empty zones — one vector op
+        unoccupied[present_now == 0] += dt
 
         # Zone status labels
-        for idx, data in enumerate(workstation_data):
-            mins_absent,  secs_absent  = divmod(int(data["unoccupied_time"]),     60)
-            mins_present, secs_present = divmod(int(data["total_presence_time"]), 60)
+        for idx in range(K):
+            mins_absent,  secs_absent  = divmod(int(unoccupied[idx]),    60)
+            mins_present, secs_present = divmod(int(presence_time[idx]), 60)
+            n = int(present_now[idx])
 
-            if data["workers_present_now"] > 0:
+            if n > 0:
                 status = (
-                    f"Zone {idx+1}: occupied ({data['workers_present_now']} worker"
-                    f"{'s' if data['workers_present_now'] > 1 else ''}) | "
+                    f"Zone {idx+1}: occupied ({n} worker"
+                    f"{'s' if n > 1 else ''}) | "
                     f"presence {mins_present:02d}m{secs_present:02d}s"
                 )
             else:
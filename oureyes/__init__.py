@@ -3,15 +3,19 @@
 from .puller import pull_stream
 from .pusher import push_stream          # kept for backward compatibility
 from .emitter import emit_detections
-from .model_registry import get_yolo, get_yolo_lock, get_siglip, get_siglip_lock, DEVICE
+from .frame_gate import FrameGate
+from .model_registry import get_yolo, get_yolo_lock, yolo_predict, get_siglip, get_siglip_lock, siglip_predict, DEVICE
 
 __all__ = [
     "pull_stream",
     "push_stream",
     "emit_detections",
+    "FrameGate",
     "get_yolo",
     "get_yolo_lock",
+    "yolo_predict",
     "get_siglip",
     "get_siglip_lock",
+    "siglip_predict",
     "DEVICE",
 ]
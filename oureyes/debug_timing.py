@@ -17,7 +17,11 @@ ENABLE_DEBUG = os.getenv("EYE_LATENCY_DEBUG", "0") == "1"
 
 _lock = threading.Lock()
 # Map: id(frame) -> (t_capture, source_name)
+# id() values recycle once a frame is freed, so entries are best-effort:
+# the map is bounded and aggressively evicted to keep stale ids (which
+# may alias a new buffer at the same address) short-lived.
 _frame_times = {}
+_MAX_TRACKED = 256
 
 
 def register_capture(source_name: str, frame) -> None:
@@ -31,6 +35,11 @@ def register_capture(source_name: str, frame) -> None:
     t = time.time()
     fid = id(frame)
     with _lock:
+        if len(_frame_times) >= _MAX_TRACKED:
+            # Oldest-first eviction (dicts keep insertion order) — those
+            # frames are long freed and their ids may already be reused.
+            for stale in list(_frame_times)[: _MAX_TRACKED // 2]:
+                del _frame_times[stale]
         _frame_times[fid] = (t, source_name)
 
 
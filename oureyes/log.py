@@ -0,0 +1,63 @@
+"""
+log.py — Non-blocking logging for hot paths.
+
+print() acquires the stdout IO lock and flushes synchronously — under an
+error burst it serializes every worker thread. Loggers returned here emit
+through a QueueHandler into one background QueueListener thread, so a log
+call from a model thread is just an enqueue.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token-bucket filter: allow bursts up to `burst` records, then at most
+    `rate` records/second. Replaces hand-rolled "print every Nth error /
+    every 30s" heuristics with one structured policy, and only consults
+    the clock when a record is actually emitted — never on silent paths.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 10):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self._tokens < 1.0:
+            self._suppressed += 1
+            return False
+        self._tokens -= 1.0
+        if self._suppressed:
+            record.msg = f"{record.msg} (+{self._suppressed} similar suppressed)"
+            self._suppressed = 0
+        return True
+
+
+_queue = queue.SimpleQueue()
+_handler = logging.StreamHandler()
+_handler.setFormatter(logging.Formatter("[%(name)s] %(levelname)s %(message)s"))
+_listener = logging.handlers.QueueListener(_queue, _handler)
+_listener.start()
+atexit.register(_listener.stop)
+
+
+def get_logger(name: str, rate: float = 1.0, burst: int = 10) -> logging.Logger:
+    """Return a rate-limited logger that never blocks the calling thread on IO."""
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.addHandler(logging.handlers.QueueHandler(_queue))
+        logger.addFilter(RateLimitFilter(rate=rate, burst=burst))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
@@ -1,5 +1,6 @@
 import json
 import os
+import threading
 from confluent_kafka import Producer
 from dotenv import load_dotenv, find_dotenv
 
@@ -17,6 +18,11 @@ def delivery_report(err, msg):
     else:
         print(f"✅ Message delivered to {msg.topic()} [{msg.partition()}]")
 
+def _poll_loop(producer):
+    """Serve delivery callbacks in the background, off the send path."""
+    while True:
+        producer.poll(0.5)
+
 def get_producer():
     """
     Return the singleton Kafka producer. Create if it doesn't exist.
@@ -28,8 +34,17 @@ def get_producer():
                 "bootstrap.servers": KAFKA_BOOTSTRAP_SERVERS,
                 "acks": "all",
                 "retries": 3,
-                "enable.idempotence": True
+                "enable.idempotence": True,
+                # Let librdkafka batch sends instead of flushing per message
+                "linger.ms": 20,
+                "batch.num.messages": 1000,
+                "compression.type": "lz4",
+                "queue.buffering.max.messages": 100000,
             })
+            threading.Thread(
+                target=_poll_loop, args=(_producer,),
+                name="kafka-poll", daemon=True,
+            ).start()
             print(f"Connected to Kafka at {KAFKA_BOOTSTRAP_SERVERS} ✅")
         except Exception as e:
             print(f"❌ Failed to connect to Kafka: {e}")
@@ -46,12 +61,12 @@ def notify_server(topic: str, data: dict):
     """
     producer = get_producer()
     try:
+        # Pure enqueue — delivery callbacks are served by the poll thread
         producer.produce(
             topic,
             value=json.dumps(data).encode("utf-8"),
             callback=delivery_report
         )
-        producer.poll(0)  # Serve delivery callbacks
     except Exception as e:
         print(f"❌ Error sending to Kafka: {e}")
 
@@ -1,265 +1,392 @@
 import asyncio
 import aiohttp
-import cv2
-import numpy as np
+import av
+import collections
+import os
+import socket
+import threading
 import time
 import traceback
 from aiortc import RTCPeerConnection, RTCSessionDescription
-from oureyes.utils import build_webrtc_url
+from oureyes.stream_manager import FrameQueue
+from oureyes.log import get_logger
+from oureyes.utils import build_webrtc_url, reconnect_delay
+
+# Rate-limited, non-blocking — a reconnect storm must not serialize the
+# frame path behind the stdout lock.
+log = get_logger("oureyes.puller", rate=2.0, burst=20)
 
 # Configuration constants
 RECONNECT_DELAY = 2  # seconds between reconnection attempts
-MAX_QUEUE_SIZE = 30  # prevent memory buildup
+# Decoder-to-consumer depth. Anything queued here is pure latency — a
+# 30-frame backlog meant up to ~1 s of stale video at 30 fps before
+# drop-oldest kicked in. Two frames absorb consumer jitter; beyond that
+# we would rather drop than delay.
+MAX_QUEUE_SIZE = 2
+SUBSCRIBER_QUEUE_SIZE = 2  # per-consumer frames buffered before dropping oldest
 FRAME_TIMEOUT = 10  # seconds without frames before considering connection lost
 CONNECTION_TIMEOUT = 30  # seconds for initial connection
 
-def pull_stream(cam_name):
+
+def _tcp_socket_factory(addr_info):
+    """Build connector sockets with latency-friendly options pre-set.
+
+    WHEP POSTs are small; Nagle would sit on them for up to ~40 ms before
+    sending. Keepalive spots half-dead NATs.
     """
-    Pull frames from WHEP stream built using cam_name.
-    Enhanced with robust reconnection, connection monitoring, and queue management.
-    Example: cam_name="fakecamera" -> http://<HOST>:<PORT>/<cam_name>/whep
-    
-    Args:
-        cam_name: Name of the camera stream to pull
-        
-    Yields:
-        numpy.ndarray: BGR frames from the stream
+    family, type_, proto = addr_info[:3]
+    sock = socket.socket(family=family, type=type_, proto=proto)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    return sock
+
+
+async def webrtc_worker(cam_name, url, queue, frame_ready, pc_event, connected_event):
     """
-    url = build_webrtc_url(cam_name)
-    print(f"🎬 Starting pull stream for: {cam_name} ({url})")
+    WebRTC worker that handles connection, frame reception, and reconnection.
 
-    async def webrtc_worker(queue, pc_event, connected_event):
-        """
-        WebRTC worker that handles connection, frame reception, and reconnection.
-        """
-        pc = None
-        recv_task = None
-        last_frame_time = None
-        
-        while True:
-            try:
-                # Clear previous connection state
-                if pc:
-                    try:
-                        await pc.close()
-                    except:
-                        pass
-                
-                pc_event.clear()
-                connected_event.clear()
-                
-                # Create new peer connection
-                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=CONNECTION_TIMEOUT)) as session:
-                    pc = RTCPeerConnection()
-                    pc_event.set()
-                    
-                    connection_state = {'failed': False}
-                    
-                    @pc.on('track')
-                    def on_track(track):
-                        nonlocal recv_task, last_frame_time
-                        print(f"✅ Track received from {cam_name}: {track.kind}")
-                        
-                        async def recv_loop():
-                            nonlocal last_frame_time
-                            while True:
-                                try:
-                                    # Wait for frame with timeout
-                                    frame = await asyncio.wait_for(track.recv(), timeout=FRAME_TIMEOUT)
-                                    img = frame.to_ndarray(format='bgr24')
-                                    last_frame_time = time.time()
-                                    
-                                    # Put frame in queue, drop old frames if queue is full
-                                    try:
-                                        queue.put_nowait(img)
-                                    except asyncio.QueueFull:
-                                        # Remove oldest frame and add new one
-                                        try:
-                                            queue.get_nowait()
-                                            queue.put_nowait(img)
-                                        except:
-                                            pass
-                                except asyncio.TimeoutError:
-                                    # Check if connection is still alive
-                                    if pc.iceConnectionState in ('failed', 'disconnected', 'closed'):
-                                        print(f"⚠️ Connection state: {pc.iceConnectionState} for {cam_name}")
-                                        break
-                                    # Check if no frames received for too long
-                                    if last_frame_time and (time.time() - last_frame_time) > FRAME_TIMEOUT:
-                                        print(f"⚠️ No frames received for {FRAME_TIMEOUT}s from {cam_name}")
-                                        break
-                                except Exception as e:
-                                    print(f"⚠️ Error receiving frame from {cam_name}: {e}")
-                                    break
-                        
-                        recv_task = asyncio.create_task(recv_loop())
-                    
-                    # Monitor ICE connection state
-                    @pc.on('iceconnectionstatechange')
-                    def on_iceconnectionstatechange():
-                        state = pc.iceConnectionState
-                        print(f"📡 ICE connection state for {cam_name}: {state}")
-                        if state in ('failed', 'disconnected', 'closed'):
-                            connection_state['failed'] = True
-                    
-                    @pc.on('connectionstatechange')
-                    def on_connectionstatechange():
-                        state = pc.connectionState
-                        print(f"🔌 Connection state for {cam_name}: {state}")
-                        if state == 'failed':
-                            connection_state['failed'] = True
-                    
-                    # Setup transceiver
-                    pc.addTransceiver('video', direction='recvonly')
-                    
-                    # Create and send offer (WHEP)
-                    offer = await pc.createOffer()
-                    await pc.setLocalDescription(offer)
-                    
-                    # Send offer to server
-                    try:
-                        async with session.post(
-                            url,
-                            headers={'Content-Type': 'application/sdp'},
-                            data=pc.localDescription.sdp,
-                            timeout=aiohttp.ClientTimeout(total=CONNECTION_TIMEOUT)
-                        ) as resp:
-                            # Accept both 200 (OK) and 201 (Created) as success
-                            if resp.status not in (200, 201):
-                                raise Exception(f"WHEP server returned status {resp.status}")
-                            answer_sdp = await resp.text()
-                    except asyncio.TimeoutError:
-                        raise Exception(f"Connection timeout to {url}")
-                    
-                    # Set remote description
-                    await pc.setRemoteDescription(
-                        RTCSessionDescription(sdp=answer_sdp, type='answer')
-                    )
-                    
-                    print(f"✅ WHEP session established for {cam_name}")
-                    connected_event.set()
-                    last_frame_time = time.time()
-                    
-                    # Monitor connection health
+    `queue` is a collections.deque(maxlen=N); `frame_ready` is the
+    asyncio.Event the consumer waits on.
+    """
+    pc = None
+    recv_task = None
+    last_frame_time = None
+
+    # One session for the worker's lifetime — reconnect attempts reuse the
+    # pooled keep-alive socket instead of paying TCP (+TLS) setup on every
+    # retry. Sessions are bound to the loop they were created on and each
+    # camera thread runs its own loop, so this cannot be a module-level
+    # singleton.
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit_per_host=4,
+            keepalive_timeout=60,
+            socket_factory=_tcp_socket_factory,
+        ),
+        timeout=aiohttp.ClientTimeout(total=CONNECTION_TIMEOUT),
+    )
+
+    attempt = 0
+    while True:
+        try:
+            # Clear previous connection state
+            if pc:
+                try:
+                    await pc.close()
+                except:
+                    pass
+
+            pc_event.clear()
+            connected_event.clear()
+
+            # Create new peer connection
+            pc = RTCPeerConnection()
+            pc_event.set()
+
+            connection_state = {'failed': False}
+            # Set by the state-change handlers and the recv task's
+            # done-callback — the health monitor awaits this instead of
+            # polling every second.
+            died = asyncio.Event()
+
+            @pc.on('track')
+            def on_track(track):
+                nonlocal recv_task, last_frame_time
+                log.info(f"✅ Track received from {cam_name}: {track.kind}")
+
+                async def recv_loop():
+                    nonlocal last_frame_time
+                    # One reformatter for the whole track — to_ndarray(format=...)
+                    # builds a fresh swscale context per frame otherwise.
+                    reformatter = av.video.reformatter.VideoReformatter()
+                    # Bare recv — no per-frame wait_for (each one allocates
+                    # a TimerHandle and a wrapper task). Stalls are caught
+                    # by the health monitor, which cancels this task.
                     while True:
-                        await asyncio.sleep(1)
-                        
-                        # Check connection state
-                        if connection_state['failed']:
-                            print(f"⚠️ Connection failed detected for {cam_name}")
-                            break
-                        
-                        # Check if recv_task is still running
-                        if recv_task and recv_task.done():
-                            print(f"⚠️ Receive task stopped for {cam_name}")
-                            try:
-                                await recv_task  # Get exception if any
-                            except Exception as e:
-                                print(f"⚠️ Receive task error: {e}")
-                            break
-                        
-                        # Check for no frames timeout
-                        if last_frame_time and (time.time() - last_frame_time) > FRAME_TIMEOUT * 2:
-                            print(f"⚠️ No frames for {FRAME_TIMEOUT * 2}s, reconnecting {cam_name}")
-                            break
-                        
-                        # Check ICE state
-                        if pc.iceConnectionState in ('failed', 'disconnected', 'closed'):
-                            print(f"⚠️ ICE state indicates disconnect for {cam_name}")
+                        try:
+                            frame = await track.recv()
+                            img = reformatter.reformat(frame, format='bgr24').to_ndarray()
+                            last_frame_time = time.monotonic()
+
+                            # deque(maxlen) displaces the oldest frame in a
+                            # single append — no QueueFull pop-then-push pair
+                            queue.append(img)
+                            frame_ready.set()
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as e:
+                            log.warning(f"⚠️ Error receiving frame from {cam_name}: {e}")
                             break
-                
-                # Cleanup
-                if recv_task and not recv_task.done():
-                    recv_task.cancel()
-                    try:
-                        await recv_task
-                    except asyncio.CancelledError:
-                        pass
-                
-                if pc:
-                    try:
-                        await pc.close()
-                    except:
-                        pass
-                
-            except Exception as e:
-                print(f"❌ Error in webrtc_worker for {cam_name}: {e}")
-                print(traceback.format_exc())
-                if pc:
-                    try:
-                        await pc.close()
-                    except:
-                        pass
-            
-            # Wait before reconnecting
-            print(f"🔄 Reconnecting {cam_name} in {RECONNECT_DELAY} seconds...")
-            await asyncio.sleep(RECONNECT_DELAY)
 
-    # Async frame generator
-    async def frame_generator():
-        queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
-        pc_event = asyncio.Event()
-        connected_event = asyncio.Event()
-        
-        # Start worker task
-        worker_task = None
-        
-        while True:
+                recv_task = asyncio.create_task(recv_loop())
+                recv_task.add_done_callback(lambda _: died.set())
+
+            # Monitor ICE connection state
+            @pc.on('iceconnectionstatechange')
+            def on_iceconnectionstatechange():
+                state = pc.iceConnectionState
+                log.info(f"📡 ICE connection state for {cam_name}: {state}")
+                if state in ('failed', 'disconnected', 'closed'):
+                    connection_state['failed'] = True
+                    died.set()
+
+            @pc.on('connectionstatechange')
+            def on_connectionstatechange():
+                state = pc.connectionState
+                log.info(f"🔌 Connection state for {cam_name}: {state}")
+                if state == 'failed':
+                    connection_state['failed'] = True
+                    died.set()
+
+            # Setup transceiver
+            pc.addTransceiver('video', direction='recvonly')
+
+            # Create and send offer (WHEP)
+            offer = await pc.createOffer()
+            await pc.setLocalDescription(offer)
+
+            # Send offer to server
             try:
-                # Start or restart worker
-                if worker_task is None or worker_task.done():
-                    worker_task = asyncio.create_task(
-                        webrtc_worker(queue, pc_event, connected_event)
-                    )
-                
-                # Wait for connection to be established
+                async with session.post(
+                    url,
+                    headers={'Content-Type': 'application/sdp'},
+                    data=pc.localDescription.sdp,
+                    timeout=aiohttp.ClientTimeout(total=CONNECTION_TIMEOUT)
+                ) as resp:
+                    # Accept both 200 (OK) and 201 (Created) as success
+                    if resp.status not in (200, 201):
+                        raise Exception(f"WHEP server returned status {resp.status}")
+                    answer_sdp = await resp.text()
+            except asyncio.TimeoutError:
+                raise Exception(f"Connection timeout to {url}")
+
+            # Set remote description
+            await pc.setRemoteDescription(
+                RTCSessionDescription(sdp=answer_sdp, type='answer')
+            )
+
+            log.info(f"✅ WHEP session established for {cam_name}")
+            connected_event.set()
+            attempt = 0
+            last_frame_time = time.monotonic()
+
+            # Monitor connection health — event-driven: failures wake us
+            # immediately instead of on the next tick of a 1 s poll. The
+            # timeout only covers the "connected but silent" stall case.
+            while True:
                 try:
-                    await asyncio.wait_for(connected_event.wait(), timeout=60)
+                    await asyncio.wait_for(died.wait(), timeout=FRAME_TIMEOUT)
                 except asyncio.TimeoutError:
-                    print(f"⚠️ Connection timeout for {cam_name}, retrying...")
+                    # No failure signal — check for a frame stall. The recv
+                    # task no longer times out on its own, so this is the
+                    # only stall detector.
+                    if last_frame_time and (time.monotonic() - last_frame_time) > FRAME_TIMEOUT:
+                        log.warning(f"⚠️ No frames for {FRAME_TIMEOUT}s, reconnecting {cam_name}")
+                        break
                     continue
-                
-                # Yield frames from queue
-                while True:
+
+                if connection_state['failed']:
+                    log.warning(f"⚠️ Connection failed detected for {cam_name}")
+                elif recv_task and recv_task.done():
+                    log.warning(f"⚠️ Receive task stopped for {cam_name}")
+                    try:
+                        await recv_task  # Get exception if any
+                    except Exception as e:
+                        log.warning(f"⚠️ Receive task error: {e}")
+                break
+
+            # Cleanup
+            if recv_task and not recv_task.done():
+                recv_task.cancel()
+                try:
+                    await recv_task
+                except asyncio.CancelledError:
+                    pass
+
+            if pc:
+                try:
+                    await pc.close()
+                except:
+                    pass
+
+        except Exception as e:
+            log.error(f"❌ Error in webrtc_worker for {cam_name}: {e}")
+            log.warning(traceback.format_exc())
+            if pc:
+                try:
+                    await pc.close()
+                except:
+                    pass
+
+        # Wait before reconnecting — fast first retries, capped backoff after
+        delay = reconnect_delay(attempt, cap=RECONNECT_DELAY)
+        attempt += 1
+        log.warning(f"🔄 Reconnecting {cam_name} in {delay:.2f} seconds...")
+        await asyncio.sleep(delay)
+
+
+async def frame_generator(cam_name, url):
+    """Async generator yielding BGR frames from the WHEP worker."""
+    # Bounded deque + event instead of asyncio.Queue: append displaces the
+    # oldest frame in one op and skips the per-item waiter bookkeeping.
+    queue = collections.deque(maxlen=MAX_QUEUE_SIZE)
+    frame_ready = asyncio.Event()
+    pc_event = asyncio.Event()
+    connected_event = asyncio.Event()
+
+    # Start worker task
+    worker_task = None
+
+    while True:
+        try:
+            # Start or restart worker
+            if worker_task is None or worker_task.done():
+                worker_task = asyncio.create_task(
+                    webrtc_worker(cam_name, url, queue, frame_ready, pc_event, connected_event)
+                )
+
+            # Wait for connection to be established
+            try:
+                await asyncio.wait_for(connected_event.wait(), timeout=60)
+            except asyncio.TimeoutError:
+                log.warning(f"⚠️ Connection timeout for {cam_name}, retrying...")
+                continue
+
+            # Yield frames from the deque; wait on the event when drained.
+            # Single-threaded loop: nothing runs between the emptiness
+            # check and the clear, so no wakeup can be lost.
+            while True:
+                if not queue:
+                    frame_ready.clear()
                     try:
-                        # Get frame with timeout to check connection
-                        frame = await asyncio.wait_for(queue.get(), timeout=5.0)
-                        yield frame
+                        await asyncio.wait_for(frame_ready.wait(), timeout=5.0)
                     except asyncio.TimeoutError:
                         # Check if connection is still alive
                         if not connected_event.is_set():
-                            print(f"⚠️ Connection lost for {cam_name}, waiting for reconnect...")
+                            log.warning(f"⚠️ Connection lost for {cam_name}, waiting for reconnect...")
                             break
                         # Continue waiting for frames
                         continue
-                        
-            except Exception as e:
-                print(f"⚠️ Error in frame_generator for {cam_name}: {e}")
-                print(traceback.format_exc())
+                yield queue.popleft()
+
+        except Exception as e:
+            log.warning(f"⚠️ Error in frame_generator for {cam_name}: {e}")
+            log.warning(traceback.format_exc())
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+class _SharedPuller:
+    """
+    One WebRTC connection per camera, shared across all pull_stream callers.
+
+    The first pull_stream(cam_name) call spawns a daemon thread that decodes
+    the stream once; every caller gets its own subscriber queue fed with the
+    same frame reference (consumers are read-only — copy before annotating).
+    """
+
+    def __init__(self, cam_name):
+        self.cam_name = cam_name
+        self.url = build_webrtc_url(cam_name)
+        self._subscribers = []
+        self._sub_lock = threading.Lock()
+        t = threading.Thread(
+            target=self._run, name=f"whep-{cam_name}", daemon=True
+        )
+        t.start()
+
+    def subscribe(self):
+        """Register a new subscriber and return its frame queue."""
+        q = FrameQueue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._sub_lock:
+            self._subscribers.append(q)
+        return q
+
+    def _fan_out(self, frame):
+        with self._sub_lock:
+            subscribers = list(self._subscribers)
+        if len(subscribers) > 1:
+            # Shared reference: make the buffer read-only so a model that
+            # wants to annotate must frame.copy() explicitly instead of
+            # silently racing the other subscribers.
+            frame.setflags(write=False)
+        for q in subscribers:
+            q.put(frame)  # same ndarray reference — no per-subscriber copy
+
+    async def _pump(self):
+        """Drain the frame generator and fan out each frame.
+
+        Runs as one long-lived coroutine — the old per-frame
+        loop.run_until_complete(agen.__anext__()) restarted the event loop
+        around every frame, which serialized the WHEP recv loop with the
+        fan-out instead of letting it run ahead.
+        """
+        agen = frame_generator(self.cam_name, self.url)
+        consecutive_errors = 0
+        max_consecutive_errors = 10
+
+        while True:
+            try:
+                frame = await agen.__anext__()
+                consecutive_errors = 0  # Reset error counter on success
+                self._fan_out(frame)
+            except StopAsyncIteration:
+                log.warning(f"⚠️ Stream ended for {self.cam_name}, restarting...")
                 await asyncio.sleep(RECONNECT_DELAY)
+                agen = frame_generator(self.cam_name, self.url)
+            except Exception as e:
+                consecutive_errors += 1
+                log.warning(f"⚠️ Error pulling frame from {self.cam_name}: {e}")
+                if consecutive_errors >= max_consecutive_errors:
+                    log.error(f"❌ Too many consecutive errors ({consecutive_errors}) for {self.cam_name}, waiting longer...")
+                    await asyncio.sleep(RECONNECT_DELAY * 2)
+                    consecutive_errors = 0
+                else:
+                    await asyncio.sleep(RECONNECT_DELAY)
+
+    def _run(self):
+        loop = None
+        if os.environ.get("EYE_UVLOOP", "0") == "1":
+            # Opt-in faster event loop — shaves scheduling overhead off the
+            # recv/fan-out path when uvloop is installed.
+            try:
+                import uvloop
+                loop = uvloop.new_event_loop()
+                log.info(f"uvloop enabled for {self.cam_name}")
+            except ImportError:
+                log.info("EYE_UVLOOP=1 but uvloop not installed — using asyncio")
+        if loop is None:
+            loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(self._pump())
+
+
+# One shared puller per camera, created on first use
+_pullers: dict = {}
+_pullers_lock = threading.Lock()
+
 
-    # Run the async generator in sync context
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    agen = frame_generator()
-    
-    consecutive_errors = 0
-    max_consecutive_errors = 10
-    
+def pull_stream(cam_name):
+    """
+    Pull frames from WHEP stream built using cam_name.
+    Enhanced with robust reconnection, connection monitoring, and queue management.
+    Example: cam_name="fakecamera" -> http://<HOST>:<PORT>/<cam_name>/whep
+
+    Multiple calls with the same cam_name share one WebRTC connection —
+    the stream is decoded once and fanned out to every caller.
+
+    Args:
+        cam_name: Name of the camera stream to pull
+
+    Yields:
+        numpy.ndarray: BGR frames from the stream
+    """
+    with _pullers_lock:
+        puller = _pullers.get(cam_name)
+        if puller is None:
+            log.info(f"🎬 Starting pull stream for: {cam_name}")
+            puller = _SharedPuller(cam_name)
+            _pullers[cam_name] = puller
+
+    q = puller.subscribe()
     while True:
-        try:
-            frame = loop.run_until_complete(agen.__anext__())
-            consecutive_errors = 0  # Reset error counter on success
-            yield frame
-        except StopAsyncIteration:
-            print(f"⚠️ Stream ended for {cam_name}, restarting...")
-            time.sleep(RECONNECT_DELAY)
-        except Exception as e:
-            consecutive_errors += 1
-            print(f"⚠️ Error pulling frame from {cam_name}: {e}")
-            if consecutive_errors >= max_consecutive_errors:
-                print(f"❌ Too many consecutive errors ({consecutive_errors}) for {cam_name}, waiting longer...")
-                time.sleep(RECONNECT_DELAY * 2)
-                consecutive_errors = 0
-            else:
-                time.sleep(RECONNECT_DELAY)
\ No newline at end of file
+        yield q.get()
@@ -1,9 +1,15 @@
+import fcntl
+import functools
+import os
+import selectors
 import subprocess
 import sys
 import time
 import threading
 import queue
 import traceback
+import numpy as np
+from oureyes.stream_manager import FrameQueue
 from oureyes.utils import build_rtsp_url
 from oureyes.debug_timing import mark_stage
 
@@ -12,6 +18,128 @@ RECONNECT_DELAY = 2  # seconds between reconnection attempts
 PROCESS_CHECK_INTERVAL = 1  # seconds between process health checks
 FRAME_BUFFER_SIZE = 30  # Buffer size for frames
 STDOUT_BUFFER_SIZE = 1000  # lines of stdout to keep for debugging
+WRITEV_BATCH = 4  # max backlogged frames coalesced into one writev syscall
+TRACEBACK_INTERVAL = 60  # seconds between full tracebacks for a repeating error
+PIPE_BUFFER_SIZE = 1 << 20  # requested stdin pipe capacity (kernel default is 64 KiB)
+
+F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)  # Linux-only fcntl
+
+
+def _make_traceback_printer():
+    """Print the first traceback immediately, then at most one per minute.
+
+    format_exc() walks and formats the whole stack — during a reconnect
+    storm that is pure CPU spent amplifying an error we already reported.
+    """
+    last = [None]
+
+    def print_traceback():
+        now = time.monotonic()
+        if last[0] is None or now - last[0] >= TRACEBACK_INTERVAL:
+            last[0] = now
+            print(traceback.format_exc())
+
+    return print_traceback
+
+
+class _StderrMultiplexer:
+    """
+    One selector thread draining stderr from every ffmpeg child.
+
+    Each push_stream used to park a dedicated reader thread in readline();
+    with N cameras that was N mostly-idle threads contending for the GIL.
+    All stderr pipes are registered with a single selector instead, and one
+    daemon thread splits the chunks into lines and hands them to the
+    per-camera sink callback.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self._sel = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._partial = {}  # fd -> trailing bytes of an incomplete line
+        # Self-pipe so register() can interrupt a blocked select()
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        self._sel.register(self._wakeup_r, selectors.EVENT_READ, None)
+        threading.Thread(target=self._run, name="ffmpeg-stderr", daemon=True).start()
+
+    def register(self, pipe, sink):
+        """Route decoded lines from an ffmpeg stderr pipe to sink(line)."""
+        fd = pipe.fileno()
+        os.set_blocking(fd, False)
+        with self._lock:
+            self._sel.register(fd, selectors.EVENT_READ, (pipe, sink))
+            self._partial[fd] = b""
+        os.write(self._wakeup_w, b"\0")
+
+    def _run(self):
+        while True:
+            for key, _ in self._sel.select():
+                if key.data is None:
+                    os.read(self._wakeup_r, 4096)
+                    continue
+                fd = key.fd
+                pipe, sink = key.data
+                try:
+                    chunk = os.read(fd, 4096)
+                except OSError:
+                    chunk = b""
+                if not chunk:
+                    # EOF — the process died; drop the registration
+                    with self._lock:
+                        self._sel.unregister(fd)
+                        tail = self._partial.pop(fd, b"")
+                    try:
+                        pipe.close()
+                    except Exception:
+                        pass
+                    if tail.strip():
+                        sink(tail.decode("utf-8", errors="ignore").strip())
+                    continue
+                data = self._partial[fd] + chunk
+                *lines, self._partial[fd] = data.split(b"\n")
+                for line in lines:
+                    msg = line.decode("utf-8", errors="ignore").strip()
+                    if msg:
+                        sink(msg)
+
+
+@functools.lru_cache(maxsize=1)
+def _nvenc_available() -> bool:
+    """Probe once whether this ffmpeg build ships h264_nvenc."""
+    try:
+        out = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, timeout=10,
+        ).stdout
+        return b"h264_nvenc" in out
+    except Exception:
+        return False
+
+
+def _writev_all(fd, bufs):
+    """writev the full batch, resuming after a rare partial write."""
+    total = sum(len(b) for b in bufs)
+    written = os.writev(fd, bufs)
+    while written < total:
+        # Skip fully-written buffers, trim the partially-written one
+        while bufs and written >= len(bufs[0]):
+            written -= len(bufs[0])
+            bufs = bufs[1:]
+        if written:
+            bufs = [bufs[0][written:]] + bufs[1:]
+            written = 0
+        total = sum(len(b) for b in bufs)
+        written = os.writev(fd, bufs)
 
 def push_stream(frames, width, height, fps, cam_name):
     """
@@ -29,7 +157,9 @@ def push_stream(frames, width, height, fps, cam_name):
     dest_url = build_rtsp_url(cam_name)
     print(f"🚀 Starting push stream to: {dest_url} ({width}x{height}@{fps}fps)")
 
-    frame_queue = queue.Queue(maxsize=FRAME_BUFFER_SIZE)
+    frame_queue = FrameQueue(maxsize=FRAME_BUFFER_SIZE)
+    print_producer_tb = _make_traceback_printer()
+    print_writer_tb = _make_traceback_printer()
     process = None
     process_lock = threading.Lock()
     stop_flag = threading.Event()
@@ -40,8 +170,10 @@ def push_stream(frames, width, height, fps, cam_name):
 
         Notes for performance:
         - Keep input as raw BGR from OpenCV
-        - Let FFmpeg convert to yuv420p for libx264
-        - Use a veryfast preset to reduce CPU load and latency
+        - Let FFmpeg convert to yuv420p for the encoder
+        - EYE_NVENC=1 routes encoding through the GPU's NVENC ASIC when the
+          ffmpeg build supports it, freeing roughly a CPU core per stream;
+          otherwise libx264 veryfast keeps CPU load and latency low
         """
         cmd = [
             "ffmpeg",
@@ -53,10 +185,23 @@ def push_stream(frames, width, height, fps, cam_name):
             "-s", f"{width}x{height}",
             "-r", str(fps),
             "-i", "-",
-            # encode with software H.264, tuned for low latency and lower CPU
-            "-c:v", "libx264",
-            "-preset", "veryfast",            # faster than "medium" to reduce CPU usage
-            "-tune", "zerolatency",
+        ]
+        if os.getenv("EYE_NVENC", "0") == "1" and _nvenc_available():
+            print(f"🖥️ NVENC hardware encoding enabled for {cam_name}")
+            cmd += [
+                "-c:v", "h264_nvenc",
+                "-preset", "p1",              # fastest NVENC preset
+                "-tune", "ll",                # low latency
+                "-rc", "cbr",
+            ]
+        else:
+            cmd += [
+                # encode with software H.264, tuned for low latency and lower CPU
+                "-c:v", "libx264",
+                "-preset", "veryfast",        # faster than "medium" to reduce CPU usage
+                "-tune", "zerolatency",
+            ]
+        cmd += [
             "-pix_fmt", "yuv420p",            # output format for broad compatibility
             "-b:v", "3M",                      # slightly lower bitrate to reduce encoder work
             "-g", str(fps),                    # GOP length ~1 second
@@ -66,25 +211,18 @@ def push_stream(frames, width, height, fps, cam_name):
             dest_url,
         ]
         return cmd
-    
-    def read_stderr(pipe):
-        """Read stderr from ffmpeg process for error logging."""
-        try:
-            for line in iter(pipe.readline, b''):
-                if line:
-                    error_msg = line.decode('utf-8', errors='ignore').strip()
-                    if error_msg:
-                        last_error_log.append(error_msg)
-                        if len(last_error_log) > 10:
-                            last_error_log.pop(0)
-                        # Only print significant errors
-                        error_lower = error_msg.lower()
-                        if any(keyword in error_lower for keyword in ['error', 'failed', 'connection refused', 'network']):
-                            print(f"⚠️ FFmpeg error for {cam_name}: {error_msg}")
-        except Exception:
-            pass
-        finally:
-            pipe.close()
+
+    # argv never changes for a given stream — build it once, not per restart
+    ffmpeg_cmd = build_ffmpeg_cmd()
+
+    def on_stderr_line(error_msg):
+        """Record an ffmpeg stderr line; print only the significant ones."""
+        last_error_log.append(error_msg)
+        if len(last_error_log) > 10:
+            last_error_log.pop(0)
+        error_lower = error_msg.lower()
+        if any(keyword in error_lower for keyword in ['error', 'failed', 'connection refused', 'network']):
+            print(f"⚠️ FFmpeg error for {cam_name}: {error_msg}")
     
     def start_ffmpeg_process():
         """Start a new ffmpeg process and return it."""
@@ -100,26 +238,29 @@ def push_stream(frames, width, height, fps, cam_name):
                     except:
                         pass
             
-            cmd = build_ffmpeg_cmd()
             print(f"🔄 Starting FFmpeg process for {cam_name}...")
-            
+
             try:
                 new_process = subprocess.Popen(
-                    cmd,
+                    ffmpeg_cmd,
                     stdin=subprocess.PIPE,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                     bufsize=0
                 )
                 
-                # Start stderr reader thread
-                stderr_thread = threading.Thread(
-                    target=read_stderr,
-                    args=(new_process.stderr,),
-                    daemon=True
-                )
-                stderr_thread.start()
-                
+                # A 1080p BGR24 frame (~6 MiB) dwarfs the default 64 KiB
+                # pipe, so every frame write stalled on back-pressure in
+                # small chunks. Grow the pipe so the kernel absorbs most of
+                # a frame per syscall (capped by fs.pipe-max-size).
+                try:
+                    fcntl.fcntl(new_process.stdin.fileno(), F_SETPIPE_SZ, PIPE_BUFFER_SIZE)
+                except OSError:
+                    pass
+
+                # Route stderr through the shared selector thread
+                _StderrMultiplexer.instance().register(new_process.stderr, on_stderr_line)
+
                 return new_process
             except Exception as e:
                 print(f"❌ Failed to start FFmpeg for {cam_name}: {e}")
@@ -127,47 +268,64 @@ def push_stream(frames, width, height, fps, cam_name):
     
     def frame_producer():
         """Read frames from generator and put them in queue."""
-        dropped_frames = 0
+        reported_dropped = 0
+        h, w = height, width  # locals: two int compares per frame, no tuple build
         try:
             for frame in frames:
                 if stop_flag.is_set():
                     break
-                
+
                 # Ensure frame is correct size
-                if frame.shape[:2] != (height, width):
-                    print(f"⚠️ Frame size mismatch for {cam_name}: expected {(height, width)}, got {frame.shape[:2]}")
-                    frame = frame[:height, :width] if frame.shape[0] >= height and frame.shape[1] >= width else frame
-                
-                # Put frame in queue (always copy to avoid modification issues)
-                try:
-                    # Mark that the frame is entering the pusher/encoder stage
-                    mark_stage("pusher_input", cam_name, frame, pop=False)
-                    frame_queue.put(frame.copy(), block=False)
-                except queue.Full:
-                    # Remove oldest frame and add new one
-                    dropped_frames += 1
-                    if dropped_frames in (1, 100, 1000) or dropped_frames % 2000 == 0:
-                        print(f"⚠️ [{cam_name}] Pusher dropped {dropped_frames} frame(s) due to full buffer")
-                    try:
-                        frame_queue.get_nowait()
-                        frame_queue.put(frame.copy(), block=False)
-                    except:
-                        pass
-                        
+                if frame.shape[0] != h or frame.shape[1] != w:
+                    print(f"⚠️ Frame size mismatch for {cam_name}: expected {(h, w)}, got {frame.shape[:2]}")
+                    frame = frame[:h, :w] if frame.shape[0] >= h and frame.shape[1] >= w else frame
+
+                # Mark that the frame is entering the pusher/encoder stage
+                mark_stage("pusher_input", cam_name, frame, pop=False)
+                # Enqueue by reference — the writer only reads the buffer,
+                # so the old per-frame copy was a pure H*W*3 memcpy.
+                # FrameQueue displaces the oldest frame itself when full.
+                frame_queue.put(frame)
+                if frame_queue.dropped - reported_dropped >= 1000:
+                    reported_dropped = frame_queue.dropped
+                    print(f"⚠️ [{cam_name}] Pusher displaced {reported_dropped} frame(s) — encoder slower than source")
+
         except Exception as e:
             print(f"⚠️ Error in frame producer for {cam_name}: {e}")
             if not stop_flag.is_set():
-                print(traceback.format_exc())
+                print_producer_tb()
         finally:
             print(f"✅ Frame producer finished for {cam_name}")
     
+    def wait_for_exit(proc):
+        """Block until proc exits or PROCESS_CHECK_INTERVAL elapses.
+
+        With pidfd_open (Linux >= 5.3) process death wakes the selector
+        immediately instead of on the next 1 s poll tick; elsewhere this
+        degrades to the old fixed-interval sleep.
+        """
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError):
+            time.sleep(PROCESS_CHECK_INTERVAL)
+            return
+        try:
+            with selectors.DefaultSelector() as sel:
+                sel.register(pidfd, selectors.EVENT_READ)
+                sel.select(timeout=PROCESS_CHECK_INTERVAL)
+        finally:
+            os.close(pidfd)
+
     def process_monitor():
         """Monitor ffmpeg process health and restart if needed."""
         nonlocal process
-        
+
         while not stop_flag.is_set():
-            time.sleep(PROCESS_CHECK_INTERVAL)
-            
+            with process_lock:
+                current = process
+            if current is not None and current.poll() is None:
+                wait_for_exit(current)
+
             with process_lock:
                 if process is None or process.poll() is not None:
                     # Process died, restart it
@@ -200,19 +358,36 @@ def push_stream(frames, width, height, fps, cam_name):
                     time.sleep(RECONNECT_DELAY)
                     continue
                 
-                # Get frame from queue with timeout
+                # Get frame from queue with timeout, then drain any small
+                # backlog so it goes out in a single writev syscall
                 try:
-                    frame = frame_queue.get(timeout=1.0)
+                    batch = [frame_queue.get(timeout=1.0)]
                 except queue.Empty:
                     continue
-                
-                # Write frame to process
+                while len(batch) < WRITEV_BATCH:
+                    try:
+                        batch.append(frame_queue.get(timeout=0))
+                    except queue.Empty:
+                        break
+
+                # Write frames to process
                 try:
                     if current_process.stdin and current_process.poll() is None:
-                        # Final stage: consume latency entry for this frame
-                        mark_stage("encoder_write", cam_name, frame, pop=True)
-                        current_process.stdin.write(frame.tobytes())
-                        current_process.stdin.flush()
+                        bufs = []
+                        for frame in batch:
+                            # Final stage: consume latency entry for this frame
+                            mark_stage("encoder_write", cam_name, frame, pop=True)
+                            # Hand the pipe the ndarray's own buffer — tobytes()
+                            # allocated a fresh W*H*3 bytes object per frame.
+                            if not frame.flags["C_CONTIGUOUS"]:
+                                frame = np.ascontiguousarray(frame)
+                            bufs.append(memoryview(frame).cast("B"))
+                        # stdin is unbuffered (bufsize=0) so no flush syscall
+                        # is needed — write/writev hit the pipe directly
+                        if len(bufs) == 1:
+                            current_process.stdin.write(bufs[0])
+                        else:
+                            _writev_all(current_process.stdin.fileno(), bufs)
                         consecutive_errors = 0  # Reset error counter on success
                     else:
                         raise Exception("Process stdin not available or process dead")
@@ -244,7 +419,7 @@ def push_stream(frames, width, height, fps, cam_name):
                 break
             except Exception as e:
                 print(f"❌ Unexpected error in frame writer for {cam_name}: {e}")
-                print(traceback.format_exc())
+                print_writer_tb()
                 time.sleep(RECONNECT_DELAY)
     
     # Start FFmpeg process
@@ -7,12 +7,14 @@ WebRTC/aiortc is NOT used here — RTSP is faster and more reliable on the same
 """
 
 import asyncio
+import collections
 import numpy as np
 import os
 import cv2
+import queue as queue_mod
 import time
 import threading
-from oureyes.utils import build_rtsp_url
+from oureyes.utils import build_rtsp_url, reconnect_delay
 
 # ── Silence OpenCV / FFmpeg noise ─────────────────────────────────────────
 os.environ["OPENCV_LOG_LEVEL"] = "SILENT"
@@ -23,11 +25,67 @@ try:
 except AttributeError:
     pass
 
+# ── FFmpeg capture options ────────────────────────────────────────────────
+# Low-latency defaults: FFmpeg's RTSP demuxer buffers frames for stream
+# probing and reordering (CAP_PROP_BUFFERSIZE is a no-op on this backend),
+# which shows up as seconds of fixed lag. nobuffer/low_delay/max_delay=0
+# disable that buffering; TCP transport avoids UDP loss-induced smearing.
+# An explicit OPENCV_FFMPEG_CAPTURE_OPTIONS in the environment wins.
+_opts = os.environ.get("OPENCV_FFMPEG_CAPTURE_OPTIONS", "")
+if not _opts:
+    _opts = "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|max_delay;0"
+
+# Optional NVDEC hardware decode (set EYE_HWACCEL=1): routes H.264 decode
+# through FFmpeg's cuvid path so the GPU's decode ASIC does the work instead
+# of one CPU core per stream. Frames still land in host memory (OpenCV API),
+# but the per-stream decode CPU cost goes away.
+if os.getenv("EYE_HWACCEL", "0") == "1":
+    _opts = f"{_opts}|hwaccel;cuvid|video_codec;h264_cuvid"
+    print("[stream_manager] NVDEC hardware decode enabled")
+
+os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = _opts
+
 # ── Constants ──────────────────────────────────────────────────────────────
 MAX_QUEUE_SIZE  = 1   # keep only the latest frame per subscriber
 RECONNECT_DELAY = 2   # seconds between reconnect attempts
 FRAME_TIMEOUT   = 10  # seconds without a frame before reconnecting
 
+# Optional decode throttle (frames/second). grab() consumes a packet without
+# decoding it; retrieve() pays the full H.264 decode + YUV->BGR conversion.
+# With EYE_TARGET_FPS set below the source rate, skipped frames cost only the
+# grab — at 30 fps in and 10 fps out that is 2/3 of the decode work removed.
+# Unset/0 decodes every frame (the old behavior).
+TARGET_FPS = float(os.getenv("EYE_TARGET_FPS", "0") or 0)
+
+
+class FrameQueue:
+    """
+    Thread-native bounded frame queue with drop-oldest semantics.
+
+    The capture thread put()s directly and model threads block on get() —
+    no event-loop hop anywhere on the frame path. With the default
+    maxsize=1 a consumer always wakes to the newest frame.
+    """
+
+    def __init__(self, maxsize: int = MAX_QUEUE_SIZE):
+        self._cond = threading.Condition()
+        self._items = collections.deque(maxlen=maxsize)
+        self.dropped = 0   # frames displaced because the consumer was slow
+
+    def put(self, item) -> None:
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)   # deque(maxlen) evicts the oldest
+            self._cond.notify()
+
+    def get(self, timeout: float = None):
+        """Block until an item is available. Raises queue.Empty on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout=timeout):
+                raise queue_mod.Empty
+            return self._items.popleft()
+
 
 class StreamBroadcaster:
     """
@@ -38,71 +96,95 @@ class StreamBroadcaster:
     def __init__(self, cam_name: str):
         self.cam_name = cam_name
         self.url = build_rtsp_url(cam_name)
-        self._queues: list[asyncio.Queue] = []
+        self._queues: list[FrameQueue] = []
         self._queues_lock = threading.Lock()
         self.connected_event = asyncio.Event()
         self._loop: asyncio.AbstractEventLoop = None
         self._stop = False
+        self._reported_dropped = 0
 
     # ── Internal capture thread ────────────────────────────────────────────
 
     def _push_frame(self, frame: np.ndarray):
-        """Thread-safe: push frame to all subscriber queues via the event loop."""
-        with self._queues_lock:
-            queues = list(self._queues)
-
+        """Push frame straight to all subscriber queues (thread-native)."""
+        # Lock-free snapshot: list.append/remove are atomic under the GIL
+        # and subscribe/unsubscribe serialise against each other via
+        # _queues_lock, so a plain copy here is always a consistent view.
+        # Saves a lock acquire + release per frame on the capture path.
+        queues = list(self._queues)
+
+        # Fan out the same ndarray reference to every subscriber — models
+        # treat frames as read-only (they copy before annotating), so the
+        # per-subscriber np.copy was pure memory traffic. Mark the buffer
+        # read-only so an accidental in-place write fails loudly.
+        if len(queues) > 1:
+            frame.setflags(write=False)
+        dropped = 0
         for queue in queues:
-            img = np.copy(frame) if len(queues) > 1 else frame
-            # Schedule put on the event loop thread — asyncio.Queue is not thread-safe
-            asyncio.run_coroutine_threadsafe(self._put_nowait(queue, img), self._loop)
-
-    @staticmethod
-    async def _put_nowait(queue: asyncio.Queue, frame: np.ndarray):
-        """Drop oldest frame and insert newest if queue is full."""
-        if queue.full():
-            try:
-                queue.get_nowait()
-            except asyncio.QueueEmpty:
-                pass
-        try:
-            queue.put_nowait(frame)
-        except asyncio.QueueFull:
-            pass  # race condition safety
+            queue.put(frame)
+            dropped += queue.dropped
+        if dropped - self._reported_dropped >= 1000:
+            self._reported_dropped = dropped
+            print(f"[stream_manager] ⚠️ {self.cam_name}: displaced "
+                  f"{dropped} stale frame(s) from slow subscribers")
 
     def _capture_thread(self):
         """Blocking loop: open RTSP, read frames, push to queues, reconnect on failure."""
+        attempt = 0
+        # One VideoCapture per camera for the thread's lifetime: open() on
+        # the same object tears down the FFmpeg input context but keeps the
+        # Python wrapper and backend allocations, so a reconnect skips the
+        # constructor overhead and only pays the stream probe itself.
+        cap = cv2.VideoCapture()
         while not self._stop:
             print(f"[stream_manager] Connecting to {self.url}")
-            cap = cv2.VideoCapture(self.url, cv2.CAP_FFMPEG)
+            cap.open(self.url, cv2.CAP_FFMPEG)
 
             if not cap.isOpened():
-                print(f"[stream_manager] ❌ Cannot open {self.url} — retrying in {RECONNECT_DELAY}s")
-                time.sleep(RECONNECT_DELAY)
+                delay = reconnect_delay(attempt, cap=RECONNECT_DELAY)
+                attempt += 1
+                print(f"[stream_manager] ❌ Cannot open {self.url} — retrying in {delay:.2f}s")
+                time.sleep(delay)
                 continue
 
+            attempt = 0
             print(f"[stream_manager] ✅ RTSP connected: {self.cam_name}")
             self._loop.call_soon_threadsafe(self.connected_event.set)
 
-            last_frame_time = time.time()
+            last_frame_time = time.monotonic()
+            decode_interval = 1.0 / TARGET_FPS if TARGET_FPS > 0 else 0.0
+            last_decode = 0.0
 
             while not self._stop:
-                ret, frame = cap.read()
-
-                if not ret:
-                    if time.time() - last_frame_time > FRAME_TIMEOUT:
+                # grab() advances the stream without decoding; retrieve()
+                # below only runs for frames we actually publish.
+                if not cap.grab():
+                    if time.monotonic() - last_frame_time > FRAME_TIMEOUT:
                         print(f"[stream_manager] ⚠️ No frames for {FRAME_TIMEOUT}s from {self.cam_name} — reconnecting")
                         break
                     time.sleep(0.01)
                     continue
 
-                last_frame_time = time.time()
+                now = time.monotonic()
+                last_frame_time = now
+
+                if decode_interval and now - last_decode < decode_interval:
+                    continue  # stream is alive; skip the decode for this frame
+
+                ret, frame = cap.retrieve()
+                if not ret:
+                    continue
+
+                last_decode = now
                 self._push_frame(frame)
 
             cap.release()
 
             if not self._stop:
-                print(f"[stream_manager] 🔄 Reconnecting {self.cam_name} in {RECONNECT_DELAY}s...")
-                time.sleep(RECONNECT_DELAY)
+                delay = reconnect_delay(attempt, cap=RECONNECT_DELAY)
+                attempt += 1
+                print(f"[stream_manager] 🔄 Reconnecting {self.cam_name} in {delay:.2f}s...")
+                time.sleep(delay)
 
     # ── Public API ─────────────────────────────────────────────────────────
 
@@ -116,14 +198,14 @@ class StreamBroadcaster:
         )
         t.start()
 
-    def subscribe(self, max_queue_size: int = MAX_QUEUE_SIZE) -> asyncio.Queue:
+    def subscribe(self, max_queue_size: int = MAX_QUEUE_SIZE) -> FrameQueue:
         """Register a new subscriber and return its frame queue."""
-        queue = asyncio.Queue(maxsize=max_queue_size)
+        queue = FrameQueue(maxsize=max_queue_size)
         with self._queues_lock:
             self._queues.append(queue)
         return queue
 
-    def unsubscribe(self, queue: asyncio.Queue):
+    def unsubscribe(self, queue: FrameQueue):
         """Remove a subscriber queue."""
         with self._queues_lock:
             if queue in self._queues:
@@ -137,9 +219,9 @@ class StreamBroadcaster:
 _broadcasters: dict[str, StreamBroadcaster] = {}
 
 
-async def get_stream(cam_name: str, max_wait_time: int = 60) -> asyncio.Queue:
+async def get_stream(cam_name: str, max_wait_time: int = 60) -> FrameQueue:
     """
-    Return a frame queue for the given camera.
+    Return a thread-native frame queue for the given camera.
     Creates and starts a StreamBroadcaster on first call; reuses it afterwards.
     """
     if cam_name not in _broadcasters:
@@ -1,15 +1,38 @@
 import os
+import random
 from dotenv import load_dotenv, find_dotenv
 
 load_dotenv(find_dotenv())
 
+
+def reconnect_delay(attempt: int, cap: float = 2.0) -> float:
+    """
+    Bounded backoff for stream reconnection.
+
+    Fast retries first (clean failures recover in ~100 ms instead of the
+    old fixed 2 s), then exponential growth capped at `cap` seconds so a
+    dead source never spins. Jittered ±20% to desynchronise cameras that
+    all lost the same upstream.
+
+    Args:
+        attempt: Consecutive failure count, starting at 0. Reset to 0 on
+                 a successful (re)connect.
+        cap:     Upper bound in seconds.
+    """
+    delay = 0.05 if attempt < 3 else min(cap, 0.05 * 2 ** (attempt - 3))
+    return delay * random.uniform(0.8, 1.2)
+
+# Host/port are fixed for the process lifetime — freeze them at import so
+# every (re)connect is a string concat instead of two env dict lookups.
+_WEBRTC_PREFIX = f"http://{os.getenv('HOST_WEBRTC', '127.0.0.1')}:{os.getenv('PORT_WEBRTC', '8889')}/"
+_RTSP_PREFIX = f"rtsp://{os.getenv('HOST', '127.0.0.1')}:{os.getenv('PORT', '8554')}/"
+
+
 def build_webrtc_url(cam_name):
     """
     Build WEBRTC URL from camera name.
     """
-    host = os.getenv("HOST_WEBRTC", "127.0.0.1")
-    port = os.getenv("PORT_WEBRTC", "8889")
-    return f"http://{host}:{port}/{cam_name}/whep"
+    return f"{_WEBRTC_PREFIX}{cam_name}/whep"
 
 
 def build_rtsp_url(cam_name: str) -> str:
@@ -17,7 +40,5 @@ def build_rtsp_url(cam_name: str) -> str:
     Build RTSP URL from a camera name.
     Example: cam_name="fakecamera" -> rtsp://20.199.41.19:8554/fakecamera
     """
-    host = os.getenv("HOST", "127.0.0.1")
-    port = os.getenv("PORT", "8554")
-    return f"rtsp://{host}:{port}/{cam_name}"
+    return _RTSP_PREFIX + cam_name
 